@@ -1,14 +1,29 @@
-# Taking array input from the user
-numbers = list(map(int, input("Enter numbers separated by spaces: ").split()))
+import heapq
+
+# Taking array input from the user, keeping every entry that is a valid integer
+numbers = []
+invalid_entries = []
+for entry in input("Enter numbers separated by spaces: ").split():
+    try:
+        numbers.append(int(entry))
+    except ValueError:
+        invalid_entries.append(entry)
+
+# Reporting the entries that could not be read as integers
+if invalid_entries:
+    print("Ignoring invalid entries:", ", ".join(invalid_entries))
+
+# Removing duplicates once and reusing the result below
+unique_numbers = set(numbers)
 
 # Checking if the array has at least two unique numbers
-if len(set(numbers)) < 2:
+if len(unique_numbers) < 2:
     print("Array must have at least two unique numbers to find the second largest.")
 else:
-    # Removing duplicates and sorting the array in descending order
-    unique_numbers = sorted(set(numbers), reverse=True)
+    # Picking the two largest unique numbers without sorting all of them
+    top_two = heapq.nlargest(2, unique_numbers)
     
-    # The second largest number is the second element in the sorted list
-    second_largest = unique_numbers[1]
+    # The second largest number is the second of the top two
+    second_largest = top_two[1]
     print("The second largest number is:", second_largest)
 
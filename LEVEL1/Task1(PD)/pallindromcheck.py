@@ -1,9 +1,15 @@
+# Translation table that deletes every whitespace character
+# (no code point above U+3000 is whitespace)
+WHITESPACE_TABLE = {code: None for code in range(0x3001) if chr(code).isspace()}
+
 # Function to check if a string is a palindrome
 def is_palindrome(string):
     # Remove spaces and convert to lowercase for uniformity
-    cleaned_string = ''.join(string.lower().split())
-    # Check if the string is equal to its reverse
-    return cleaned_string == cleaned_string[::-1]
+    cleaned_string = string.lower().translate(WHITESPACE_TABLE)
+    # Compare the first half with the reversed second half; the middle
+    # character of an odd-length string never needs checking
+    half = len(cleaned_string) // 2
+    return cleaned_string[:half] == cleaned_string[:(len(cleaned_string) - 1) // 2:-1]
 
 # Input from the user
 user_input = input("Enter a string to check if it's a palindrome: ")
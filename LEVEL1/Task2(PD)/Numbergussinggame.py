@@ -1,5 +1,12 @@
 import random
 
+# (max_number, max_attempts) for each difficulty menu choice
+DIFFICULTY_LEVELS = {
+    '1': (50, 7),
+    '2': (100, 6),
+    '3': (200, 5),
+}
+
 def number_guessing_game():
     print("Welcome to the Number Guessing Game!")
     
@@ -10,18 +17,11 @@ def number_guessing_game():
     print("3. Hard (1-200)")
     
     difficulty = input("Enter your choice (1/2/3): ")
-    if difficulty == '1':
-        max_number = 50
-        max_attempts = 7
-    elif difficulty == '3':
-        max_number = 200
-        max_attempts = 5
-    else:
-        max_number = 100
-        max_attempts = 6
+    # Any other input falls back to Normal
+    max_number, max_attempts = DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS['2'])
 
     # Randomly pick a number within the range
-    secret_number = random.randint(1, max_number)
+    secret_number = random.randrange(1, max_number + 1)
     print(f"\nI have picked a number between 1 and {max_number}. Can you guess it?")
     print(f"You have {max_attempts} attempts. Good luck!\n")
 
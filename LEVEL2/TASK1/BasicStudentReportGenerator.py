@@ -1,10 +1,11 @@
 class Student:
+    __slots__ = ('name', 'marks', 'total', 'average')
+
     def __init__(self, name: str, marks: list[float]):
         """Initialize student with name and marks for 3 subjects."""
         self.name = name
         self.marks = marks
-        self.total = 0.0
-        self.average = 0.0
+        self.calculate_total_and_average()
 
     def calculate_total_and_average(self):
         """Compute total and average marks."""
@@ -26,6 +27,22 @@ class ReportGenerator:
     def __init__(self):
         self.students = []
 
+    def input_marks_line(self) -> list[float] | None:
+        """Read all 3 marks from one comma-separated line, or None to enter them one by one."""
+        raw = input("Enter marks for 3 subjects separated by commas "
+                    "(or press Enter to type them one by one): ").strip()
+        if not raw:
+            return None
+        try:
+            marks = [float(value) for value in raw.split(',')]
+        except ValueError:
+            print("Invalid input. Please enter the marks one by one.")
+            return None
+        if len(marks) != 3 or not all(0 <= mark <= 100 for mark in marks):
+            print("Expected 3 marks between 0 and 100. Please enter them one by one.")
+            return None
+        return marks
+
     def input_student_data(self):
         """Collect student data from user."""
         try:
@@ -33,21 +50,21 @@ class ReportGenerator:
             for i in range(num_students):
                 print(f"\n--- Student {i+1} ---")
                 name = input("Enter student name: ").strip()
-                marks = []
-                for j in range(3):
-                    while True:
-                        try:
-                            mark = float(input(f"Enter marks for Subject {j+1}: "))
-                            if 0 <= mark <= 100:
-                                marks.append(mark)
-                                break
-                            else:
-                                print("Marks must be between 0 and 100.")
-                        except ValueError:
-                            print("Invalid input. Please enter a number.")
-                student = Student(name, marks)
-                student.calculate_total_and_average()
-                self.students.append(student)
+                marks = self.input_marks_line()
+                if marks is None:
+                    marks = []
+                    for j in range(3):
+                        while True:
+                            try:
+                                mark = float(input(f"Enter marks for Subject {j+1}: "))
+                                if 0 <= mark <= 100:
+                                    marks.append(mark)
+                                    break
+                                else:
+                                    print("Marks must be between 0 and 100.")
+                            except ValueError:
+                                print("Invalid input. Please enter a number.")
+                self.students.append(Student(name, marks))
         except ValueError:
             print("Invalid number of students.")
 
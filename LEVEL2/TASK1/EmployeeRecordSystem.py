@@ -1,4 +1,6 @@
 class Employee:
+    __slots__ = ('emp_id', 'name', 'department', 'salary')
+
     def __init__(self, emp_id: str, name: str, department: str, salary: float):
         """Initialize employee details."""
         self.emp_id = emp_id
@@ -6,13 +8,15 @@ class Employee:
         self.department = department
         self.salary = salary
 
-    def display(self):
-        """Display employee details."""
-        print(f"\nEmployee ID   : {self.emp_id}")
-        print(f"Name          : {self.name}")
-        print(f"Department    : {self.department}")
-        print(f"Salary        : ₹{self.salary:.2f}")
-        print("-" * 30)
+    def get_details(self) -> str:
+        """Return formatted employee details."""
+        return (
+            f"\nEmployee ID   : {self.emp_id}\n"
+            f"Name          : {self.name}\n"
+            f"Department    : {self.department}\n"
+            f"Salary        : ₹{self.salary:.2f}\n"
+            f"{'-'*30}"
+        )
 
 
 class EmployeeRecordSystem:
@@ -41,8 +45,7 @@ class EmployeeRecordSystem:
             print("\n⚠️ No employee records found.")
         else:
             print("\n=== Employee Records ===")
-            for emp in self.employees:
-                emp.display()
+            print("\n".join(emp.get_details() for emp in self.employees))
 
 
 def main():
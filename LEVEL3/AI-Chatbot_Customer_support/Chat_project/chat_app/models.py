@@ -19,3 +19,9 @@ class ChatHistory(models.Model):
     
     class Meta:
         verbose_name_plural = "Chat Histories"
+        # session_id is already indexed through unique=True; these cover
+        # expiry sweeps by last activity and newest-first listings.
+        indexes = [
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['-created_at']),
+        ]
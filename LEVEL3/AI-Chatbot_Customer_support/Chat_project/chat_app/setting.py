@@ -11,13 +11,12 @@ except Exception:
                     line = line.strip()
                     if not line or line.startswith('#'):
                         continue
-                    if '=' not in line:
-                        continue
-                    key, val = line.split('=', 1)
+                    key, sep, val = line.partition('=')
                     key = key.strip()
-                    val = val.strip().strip('"').strip("'")
-                    if key and key not in os.environ:
-                        os.environ[key] = val
+                    if not sep or not key:
+                        continue
+                    # Existing environment variables take precedence over .env values
+                    os.environ.setdefault(key, val.strip().strip('"').strip("'"))
         except FileNotFoundError:
             # No .env file present; nothing to load.
             pass
@@ -36,7 +35,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # IMPORTANT: You must change this in production!
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-n2b7=5g@1*k1d0g7k*6k7g$c8n2l9j4x2p8g0v!c9d7q5e3t0f0y')
 
-DEBUG = True
+# Debug mode adds per-request overhead; opt in with DJANGO_DEBUG=1 for development.
+DEBUG = os.environ.get('DJANGO_DEBUG', '0') == '1'
 
 # Allows access from Codespaces development URLs
 ALLOWED_HOSTS = ['*'] 
@@ -64,6 +64,8 @@ MIDDLEWARE = [
     # CORS middleware MUST be placed before CommonMiddleware
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.security.SecurityMiddleware',
+    # Compresses responses (e.g. long AI answers) for clients that accept gzip
+    'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -73,9 +75,15 @@ MIDDLEWARE = [
 ]
 
 # --- 4. CORS CONFIGURATION (Crucial for Codespaces) ---
-# Allows any domain to access your API endpoints for development testing.
-# This setting is required since your HTML file is served separately from Django.
-CORS_ALLOW_ALL_ORIGINS = True
+# Comma-separated list of origins allowed to call the API, e.g.
+# CORS_ORIGINS=https://example.com,https://my-codespace.github.dev
+CORS_ALLOWED_ORIGINS = [origin.strip() for origin in os.environ.get('CORS_ORIGINS', '').split(',') if origin.strip()]
+# In development (DEBUG on) without an explicit list, allow any domain; this is
+# required when your HTML file is served separately from Django. Otherwise
+# only the origins listed in CORS_ORIGINS may call the API.
+CORS_ALLOW_ALL_ORIGINS = DEBUG and not CORS_ALLOWED_ORIGINS
+# Only API routes need CORS headers; admin and static requests skip the check.
+CORS_URLS_REGEX = r'^/api/.*$'
 
 
 # --- 5. URLS AND TEMPLATES (Standard Django) ---
@@ -112,7 +120,9 @@ DATABASES = {
             # IMPORTANT: If your MongoDB is hosted elsewhere (e.g., MongoDB Atlas),
             # replace 'mongodb://localhost:27017/' with your full connection string
             'authMechanism': 'SCRAM-SHA-1', # Default auth mechanism for MongoDB
-        }
+        },
+        # Reuse the database connection across requests instead of reconnecting each time
+        'CONN_MAX_AGE': 60,
     }
 }
 
@@ -138,4 +148,33 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# --- 9. CACHING ---
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Most recently used Gemini replies, kept in this process's memory. The
+    # short timeout bounds how long a reply copied from the disk cache can
+    # still be served after its disk entry has expired (at most one hour).
+    'ai_responses_memory': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ai-responses',
+        'TIMEOUT': 60 * 60,  # One hour
+        'OPTIONS': {
+            'MAX_ENTRIES': 4096,
+        },
+    },
+    # Gemini replies to common questions, kept on disk so they survive restarts
+    'ai_responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'ai_response_cache',
+        'TIMEOUT': 60 * 60 * 24 * 7,  # One week
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
\ No newline at end of file
@@ -0,0 +1,142 @@
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from .view import CircuitBreaker, TokenBucket, fetch_ai_response, request_ai_response
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def open_circuit(self, breaker):
+        for _ in range(breaker.fail_max):
+            breaker.record_failure()
+
+    def test_refuses_requests_while_open(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        self.open_circuit(breaker)
+        self.assertFalse(breaker.allow_request())
+
+    def test_half_open_lets_a_single_trial_through(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.open_circuit(breaker)
+        with mock.patch('chat_app.view.time.monotonic', return_value=131):
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+
+    def test_successful_trial_closes_the_circuit(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.open_circuit(breaker)
+        with mock.patch('chat_app.view.time.monotonic', return_value=131):
+            self.assertTrue(breaker.allow_request())
+            breaker.record_success()
+            self.assertTrue(breaker.allow_request())
+            self.assertTrue(breaker.allow_request())
+
+    def test_failed_trial_reopens_the_circuit(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.open_circuit(breaker)
+        with mock.patch('chat_app.view.time.monotonic', return_value=131):
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()
+            self.assertFalse(breaker.allow_request())
+        with mock.patch('chat_app.view.time.monotonic', return_value=162):
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+
+    def test_released_trial_lets_another_through(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.open_circuit(breaker)
+        with mock.patch('chat_app.view.time.monotonic', return_value=131):
+            self.assertTrue(breaker.allow_request())
+            breaker.release_request()
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+
+    def post_with_status(self, breaker, status):
+        response = mock.Mock(status_code=status)
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+        rate_limiter = mock.Mock()
+        rate_limiter.try_acquire.return_value = True
+        with mock.patch('chat_app.view.GEMINI_CIRCUIT', breaker), \
+                mock.patch('chat_app.view.GEMINI_RATE_LIMITER', rate_limiter), \
+                mock.patch('chat_app.view.GEMINI_SESSION.post', return_value=response), \
+                self.assertRaises(requests.exceptions.HTTPError):
+            request_ai_response("Where is my order?")
+
+    def test_client_errors_do_not_open_the_circuit(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        for _ in range(5):
+            self.post_with_status(breaker, 400)
+        self.assertTrue(breaker.allow_request())
+
+    def test_server_errors_open_the_circuit(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        for _ in range(2):
+            self.post_with_status(breaker, 503)
+        self.assertFalse(breaker.allow_request())
+
+    def test_client_error_frees_the_half_open_trial(self):
+        breaker = CircuitBreaker(fail_max=2, reset_timeout=30)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.open_circuit(breaker)
+        with mock.patch('chat_app.view.time.monotonic', return_value=131):
+            self.post_with_status(breaker, 400)
+            self.assertTrue(breaker.allow_request())
+            self.assertFalse(breaker.allow_request())
+
+
+class TokenBucketTests(SimpleTestCase):
+
+    def make_bucket(self, rate, capacity):
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            return TokenBucket(rate=rate, capacity=capacity)
+
+    def test_allows_a_burst_up_to_capacity(self):
+        bucket = self.make_bucket(rate=1, capacity=3)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.assertEqual([bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+
+    def test_refills_at_the_given_rate(self):
+        bucket = self.make_bucket(rate=1, capacity=1)
+        with mock.patch('chat_app.view.time.monotonic', return_value=100):
+            self.assertTrue(bucket.try_acquire())
+        with mock.patch('chat_app.view.time.monotonic', return_value=100.5):
+            self.assertFalse(bucket.try_acquire())
+        with mock.patch('chat_app.view.time.monotonic', return_value=101.5):
+            self.assertTrue(bucket.try_acquire())
+
+    def test_refill_is_capped_at_capacity(self):
+        bucket = self.make_bucket(rate=1, capacity=2)
+        with mock.patch('chat_app.view.time.monotonic', return_value=1000):
+            self.assertEqual([bucket.try_acquire() for _ in range(3)], [True, True, False])
+
+    def test_a_minute_admits_at_most_the_rate_plus_the_burst(self):
+        bucket = self.make_bucket(rate=1, capacity=6)
+        admitted = 0
+        for tick in range(600):
+            with mock.patch('chat_app.view.time.monotonic', return_value=100 + tick / 10):
+                admitted += bucket.try_acquire()
+        self.assertLessEqual(admitted, 60 + 6)
+
+
+class FetchAIResponseTests(SimpleTestCase):
+
+    def test_unreadable_persistent_entry_is_a_cache_miss(self):
+        memory_cache = mock.Mock()
+        memory_cache.get.return_value = None
+        persistent_cache = mock.Mock()
+        persistent_cache.get.side_effect = EOFError("Ran out of input")
+        cache_aliases = {'ai_responses_memory': memory_cache, 'ai_responses': persistent_cache}
+        with mock.patch('chat_app.view.caches', cache_aliases), \
+                mock.patch('chat_app.view.request_ai_response', return_value="Fresh reply") as request:
+            self.assertEqual(fetch_ai_response("Where is my order?"), "Fresh reply")
+        request.assert_called_once_with("Where is my order?")
+        cache_key = persistent_cache.get.call_args.args[0]
+        persistent_cache.delete.assert_called_once_with(cache_key)
+        persistent_cache.set.assert_called_once_with(cache_key, "Fresh reply")
@@ -1,8 +1,16 @@
+import hashlib
 import json
 import logging
 import os
+import pickle
+import threading
+import time
+import zlib
 import requests # Essential for making external API calls
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from django.core.cache import caches
 from django.http import JsonResponse
 
 try:
@@ -16,9 +24,29 @@ except Exception:
     def require_POST(view_func):
         return view_func
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the standard library json module is used without it
+    orjson = None
+
 # Configure basic logging to see issues in your Codespaces console
 logger = logging.getLogger(__name__)
 
+
+def _json_dumps(obj):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # --- 1. GEMINI API CONFIGURATION ---
 
 # Retrieve the API Key from the environment. This key MUST be set 
@@ -27,6 +55,49 @@ API_KEY = os.environ.get("GEMINI_API_KEY")
 
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-09-2025:generateContent"
 
+# The request URL includes the API Key as a query parameter; both are fixed
+# for the life of the process, so the URL and headers are built only once.
+GEMINI_URL_WITH_KEY = f"{GEMINI_API_URL}?key={API_KEY}"
+GEMINI_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _positive_int_from_env(name, default):
+    """Reads a positive integer setting, falling back to default if it is invalid."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        logger.warning("%s must be a positive whole number, got %r; using %d.", name, value, default)
+        return default
+    return number
+
+
+# Outbound request budget so traffic spikes are turned away up front instead
+# of failing upstream with 429s. Calls are admitted at this steady rate plus a
+# burst of a tenth of it, so any 60-second window sees at most 1.1x the value.
+# The budget is per process: with several WSGI workers the total is workers x
+# that, so set it a little under the Gemini quota divided by the workers.
+GEMINI_REQUESTS_PER_MINUTE = _positive_int_from_env("GEMINI_REQUESTS_PER_MINUTE", 60)
+
+# Shared HTTP session so the TCP/TLS connection to Gemini is kept alive and
+# reused across chat requests instead of being re-established every time.
+GEMINI_SESSION = requests.Session()
+GEMINI_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    # Retry briefly on rate limits and server errors before giving up; a long
+    # Retry-After from Gemini is not honoured so a worker is never held for it.
+    # Read errors are not retried: a timed-out generateContent call may already
+    # have been processed, and retrying it would multiply the worker's wait.
+    # Connect errors are not retried either, so a network outage fails fast.
+    max_retries=Retry(total=2, connect=0, read=0, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"POST"}), respect_retry_after_header=False),
+))
+
 # System instruction to define the chatbot's persona and rules
 SYSTEM_INSTRUCTION = (
     "You are a friendly, professional, and efficient Customer Support Assistant for an e-commerce "
@@ -37,58 +108,256 @@ SYSTEM_INSTRUCTION = (
 
 # --- 2. GENERATIVE AI SERVICE LAYER ---
 
-def get_ai_response_from_gemini(user_query):
+# Django caches (see CACHES in settings): answers kept in this process's
+# memory, and answers kept on disk so they survive restarts
+MEMORY_CACHE_ALIAS = 'ai_responses_memory'
+PERSISTENT_CACHE_ALIAS = 'ai_responses'
+
+
+# The API payload. Everything except the user's text is constant, so it is
+# serialized once here; the None placeholder marks where the query goes.
+PAYLOAD_PREFIX, PAYLOAD_SUFFIX = _json_dumps({
+    "contents": [{
+        "parts": [{"text": None}]
+    }],
+    "systemInstruction": {
+        "parts": [{"text": SYSTEM_INSTRUCTION}]
+    },
+    # Optional: set temperature for more focused (less creative) responses for support
+    "config": {
+        "temperature": 0.2
+    }
+}).split(b'null', 1)
+
+# Cached answers are only valid for this model, persona and configuration, so
+# a short hash of them is part of every cache key; changing any of them makes
+# the old answers unreachable instead of serving them until they expire.
+RESPONSE_CACHE_VERSION = hashlib.blake2b(
+    PAYLOAD_PREFIX + PAYLOAD_SUFFIX + GEMINI_API_URL.encode('utf-8'), digest_size=4
+).hexdigest()
+
+
+class EmptyAIResponseError(Exception):
+    """Raised when Gemini answers without any generated text."""
+
+
+class RateLimitExceededError(Exception):
+    """Raised instead of calling Gemini when the request budget is used up."""
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling Gemini while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream service for reset_timeout seconds after
+    fail_max consecutive failures, so an outage fails fast instead of
+    holding every request for the full timeout. Once the timeout has passed,
+    a single trial request is let through (half-open) and every other
+    request is refused until that trial succeeds or fails.
+    """
+
+    def __init__(self, fail_max, reset_timeout):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._half_open = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._half_open or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            # Let exactly one trial request through; its outcome closes or reopens the circuit
+            self._half_open = True
+            return True
+
+    def release_request(self):
+        """Gives back an allowed request that was never sent."""
+        with self._lock:
+            self._half_open = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._half_open or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+                self._half_open = False
+
+
+GEMINI_CIRCUIT = CircuitBreaker(fail_max=5, reset_timeout=30)
+
+
+def is_upstream_outage(error):
+    """
+    Returns True if error suggests Gemini itself is unavailable (connection
+    problems, timeouts, rate limiting or server errors) rather than that the
+    request was rejected, so that bad prompts do not trip the circuit.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return isinstance(error, (requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout,
+                              requests.exceptions.RetryError))
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to capacity calls, refilled at rate calls per second.
+    State is kept in memory, so each process has its own bucket.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+GEMINI_RATE_LIMITER = TokenBucket(rate=GEMINI_REQUESTS_PER_MINUTE / 60,
+                                  capacity=max(1, GEMINI_REQUESTS_PER_MINUTE // 10))
+
+
+def normalize_query(user_query):
+    """
+    Lowercases the query and collapses whitespace so that repeated questions
+    share a single cache entry. Only used for cache keys, never sent to Gemini.
+    """
+    return ' '.join(user_query.lower().split())
+
+
+def response_cache_key(normalized_query):
+    """Returns a short, fixed-length cache key for a normalized query."""
+    digest = hashlib.blake2b(normalized_query.encode('utf-8'), digest_size=16).hexdigest()
+    return f"gemini:{RESPONSE_CACHE_VERSION}:{digest}"
+
+
+def fetch_ai_response(user_query):
+    """
+    Returns the answer for user_query, checking the in-memory and then the
+    persistent cache before calling the Gemini API. Both caches are keyed on
+    the normalized query, but on a miss the user's original text is sent.
+    Errors are raised rather than returned, so only real answers are cached.
+    """
+    cache_key = response_cache_key(normalize_query(user_query))
+    memory_cache = caches[MEMORY_CACHE_ALIAS]
+    cached_text = memory_cache.get(cache_key)
+    if cached_text is not None:
+        return cached_text
+
+    persistent_cache = caches[PERSISTENT_CACHE_ALIAS]
+    try:
+        cached_text = persistent_cache.get(cache_key)
+    except (OSError, EOFError, pickle.UnpicklingError, zlib.error) as e:
+        # An unreadable entry is treated as a miss and removed so it is rebuilt
+        logger.error("Could not read Gemini reply from the persistent cache: %s", e)
+        cached_text = None
+        try:
+            persistent_cache.delete(cache_key)
+        except OSError:
+            pass
+    if cached_text is None:
+        cached_text = request_ai_response(user_query)
+        try:
+            persistent_cache.set(cache_key, cached_text)
+        except OSError as e:
+            # The reply is already paid for; still return it if it cannot be stored
+            logger.error("Could not store Gemini reply in the persistent cache: %s", e)
+    memory_cache.set(cache_key, cached_text)
+    return cached_text
+
+
+def request_ai_response(user_query):
     """
     Constructs the payload and sends the request to the Gemini API.
     """
-    if not API_KEY:
-        # Raise an exception if the key is missing from the environment
-        raise ValueError("GEMINI_API_KEY environment variable not set.")
-    
-    # Construct the API payload
-    payload = {
-        "contents": [{
-            "parts": [{"text": user_query}]
-        }],
-        "systemInstruction": {
-            "parts": [{"text": SYSTEM_INSTRUCTION}]
-        },
-        # Optional: set temperature for more focused (less creative) responses for support
-        "config": { 
-            "temperature": 0.2
-        }
-    }
+    # Splice the JSON-encoded query into the pre-serialized payload
+    payload = PAYLOAD_PREFIX + _json_dumps(user_query) + PAYLOAD_SUFFIX
 
-    # The request URL includes the API Key as a query parameter
-    url_with_key = f"{GEMINI_API_URL}?key={API_KEY}"
-    
+    # Check the circuit first so requests it refuses do not use up the budget
+    if not GEMINI_CIRCUIT.allow_request():
+        raise CircuitOpenError("Gemini API calls are paused after repeated failures.")
+    if not GEMINI_RATE_LIMITER.try_acquire():
+        GEMINI_CIRCUIT.release_request()
+        raise RateLimitExceededError("Gemini request budget exhausted.")
+
+    # Make the API call
     try:
-        # Make the API call
-        response = requests.post(
-            url_with_key,
-            headers={'Content-Type': 'application/json'},
-            data=json.dumps(payload),
-            timeout=15 # Set a timeout for the external request
+        response = GEMINI_SESSION.post(
+            GEMINI_URL_WITH_KEY,
+            headers=GEMINI_HEADERS,
+            data=payload,
+            timeout=(3.05, 15) # Give up quickly on connecting, allow time for the reply
         )
         response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-
-        # Parse the response and extract the generated text
-        result = response.json()
-        
-        # Accessing the generated text from the response structure
-        generated_text = result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
-        
-        if generated_text:
-            return generated_text
+    except Exception as e:
+        # Every outcome must be reported, or a half-open circuit would stay stuck
+        if is_upstream_outage(e):
+            GEMINI_CIRCUIT.record_failure()
         else:
-            logger.error(f"Gemini API returned no text: {result}")
-            return "I apologize, the AI service failed to generate a response."
+            GEMINI_CIRCUIT.release_request()
+        raise
+    GEMINI_CIRCUIT.record_success()
+
+    # Parse the response and extract the generated text
+    result = _json_loads(response.content)
+
+    # Accessing the generated text from the response structure
+    try:
+        generated_text = result['candidates'][0]['content']['parts'][0]['text']
+    except (KeyError, IndexError, TypeError):
+        generated_text = ''
+
+    if not generated_text:
+        raise EmptyAIResponseError(result)
+    return generated_text
+
+
+def get_ai_response_from_gemini(user_query):
+    """
+    Returns the assistant's reply to user_query, answering repeated questions
+    from the cache instead of calling the Gemini API again.
+    """
+    if not API_KEY:
+        # Raise an exception if the key is missing from the environment
+        raise ValueError("GEMINI_API_KEY environment variable not set.")
+
+    try:
+        return fetch_ai_response(user_query)
 
+    except RateLimitExceededError:
+        logger.warning("Gemini request budget exhausted; turning the request away.")
+        return "I'm helping a lot of customers right now. Please try again in a minute."
+    except EmptyAIResponseError as e:
+        logger.error("Gemini API returned no text: %s", e)
+        return "I apologize, the AI service failed to generate a response."
     except requests.exceptions.RequestException as e:
-        logger.error(f"HTTP Request Error to Gemini API: {e}")
+        logger.error("HTTP Request Error to Gemini API: %s", e)
         return "I'm experiencing connectivity issues with my AI brain. Please try again shortly."
     except Exception as e:
-        logger.error(f"Unexpected error in Gemini request: {e}")
+        logger.error("Unexpected error in Gemini request: %s", e)
         return "An internal error occurred while processing your query."
 
 
@@ -101,9 +370,9 @@ def chat_api_view(request):
     The main API endpoint that connects the frontend to the generative AI service.
     """
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         user_message = data.get('user_message', '').strip()
-    except json.JSONDecodeError:
+    except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
         logger.error("Invalid JSON received.")
         return JsonResponse({'error': 'Invalid JSON format'}, status=400)
     
@@ -118,11 +387,11 @@ def chat_api_view(request):
     
     except ValueError as e:
         # This catches the error if the API key is missing
-        logger.critical(f"Configuration Error: {e}")
+        logger.critical("Configuration Error: %s", e)
         return JsonResponse({
             'ai_response': f"Configuration Error: {e}. Please ensure your GEMINI_API_KEY is set in your .env file."
         }, status=500)
     
     except Exception as e:
-        logger.error(f"Error in chat_api_view: {e}")
+        logger.error("Error in chat_api_view: %s", e)
         return JsonResponse({'ai_response': "A critical server error occurred."}, status=500)